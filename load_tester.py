@@ -12,11 +12,44 @@
 # Timeout per Request: Currently, there's a global timeout for requests. 
 # You could add an option to specify a timeout for each individual request.
 
-import argparse, time
-import requests, math, threading
+import argparse, os, time, asyncio
+import requests, threading, itertools
+import concurrent.futures, queue, socket, ssl, urllib.parse
+import http.cookiejar
+import aiohttp
+from requests.adapters import HTTPAdapter
 import numpy as np
 from tqdm import tqdm
 
+class _StaleConnection(ConnectionError):
+    """
+    A pooled keep-alive socket turned out to be closed before the server saw any of the request.
+    """
+
+def _partition_percentiles(arr, qs) -> np.ndarray:
+    """Percentiles of `arr` with np.percentile's linear interpolation, from a single O(N) partition.
+
+    Args:
+        arr (np.ndarray): Non-empty 1-D sample array.
+        qs (np.ndarray): Percentiles in [0, 100].
+
+    Returns:
+        np.ndarray: One value per entry of `qs`.
+    """
+    pos = qs / 100.0 * (arr.size - 1)
+    below = np.floor(pos).astype(np.intp)
+    above = np.minimum(below + 1, arr.size - 1)
+    # Only the order statistics either side of each position need to land in place
+    part = np.partition(arr, np.unique(np.concatenate((below, above))))
+    return part[below] + (part[above] - part[below]) * (pos - below)
+
+def _to_microseconds(seconds) -> np.ndarray:
+    """
+    Quantize times in seconds to the whole-microsecond uint32 scale the latencies are stored in.
+    """
+    micros = np.rint(np.asarray(seconds, dtype=np.float64) * 1e6)
+    return np.clip(micros, 0, np.iinfo(np.uint32).max).astype(np.uint32)
+
 class LoadTester:
     def __init__(self, kwargs):
         """Initialize the LoadTester object.
@@ -32,31 +65,109 @@ class LoadTester:
                 - payload (dict or str, optional): Request payload (default is None).
                 - logging (bool, optional): Whether logging is enabled (default is True).
                 - percentiles (list of float, optional): List of percentiles for latency reporting (default is None).
+                - concurrency (int, optional): Maximum number of in-flight requests (default is 64).
+                - backend (str, optional): HTTP client to use, one of "aiohttp", "httpx", "requests" or "raw" (default is "aiohttp").
+                - event_loop (str, optional): Event loop for the aiohttp and httpx backends, either "asyncio" or "uvloop" (default is "asyncio").
 
         Raises:
             KeyError: If any required key is missing in kwargs.
+            ValueError: If any percentile lies outside [0, 100].
         """
         
         print("Starting Load Tester")
+        # Convert once here so the report's vectorized calls get ready-made float arrays
+        self.percentiles = np.asarray(kwargs['percentiles'] or [], dtype=np.float64)
+        # Validate once here, before any log file or thread is created, instead of on
+        # every np.percentile call in the report
+        if np.any((self.percentiles < 0) | (self.percentiles > 100)):
+            raise ValueError("Percentiles must be in the range [0, 100]")
+        self.reponses = np.asarray(kwargs['response_thres'] or [], dtype=np.float64)
+
         self.url = kwargs['url']
         self.qps = kwargs['qps']
         self.timeout = kwargs['timeout']
         self.headers = kwargs['headers']
         self.payload = kwargs['payload']
-        self.errors = 0
-        self.latencies = []
         self.max_requests = kwargs['max_requests']
-        self.request_count = 0  # Counter for requests made
+        # Per-request samples live in preallocated, contiguous column buffers (one array per
+        # field). Producers claim a slot with next(self._slots), a GIL-atomic fetch-and-add,
+        # so recording never takes a lock.
+        # A status code of 0 marks a slot that has not been written yet, -1 a failed request.
+        self.timestamps = np.empty(self.max_requests, dtype=np.float64)
+        # Latencies are whole microseconds measured on the monotonic perf_counter_ns() clock,
+        # so the conversion stays in integers: uint32 covers ~71 minutes at half the width of float64
+        self.latencies_us = np.empty(self.max_requests, dtype=np.uint32)
+        self.status_codes = np.zeros(self.max_requests, dtype=np.int16)
+        self._slots = itertools.count()
         self.method = kwargs['method'].upper()
+        self.concurrency = kwargs.get('concurrency', 64)
+        self.backend = kwargs.get('backend', 'aiohttp')
+        self.event_loop = kwargs.get('event_loop', 'asyncio')
+
+        # The event-loop backends own their clients inside run(); only the
+        # thread-based backends need a worker pool here
+        if self.backend == "requests":
+            # Reuse keep-alive connections across requests on the sync path,
+            # with one pooled connection per worker thread
+            self.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.concurrency, pool_maxsize=self.concurrency, max_retries=0)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+            # Pool connections but not cookies: each request starts clean, as a one-off request would
+            self.session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        if self.backend in ("requests", "raw"):
+            # Fixed set of worker threads for the sync path; workers are started lazily on first submit
+            self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency)
+        if self.backend == "raw":
+            self._build_raw_request()
         
         # Create the Log_file if log enabled
         self.log_enabled = kwargs['logging']
         # Check for Logging; Default is TRUE
         if self.log_enabled:
             self.log_file = "load_test_log"+str(time.time())+".txt"
-        
-        self.percentiles = kwargs['percentiles'] if kwargs['percentiles'] else []
-        self.reponses = kwargs['response_thres'] if kwargs['response_thres'] else []
+            # Keep one buffered handle open for the whole run instead of reopening per request
+            self._log_fh = open(self.log_file, 'a', buffering=1 << 20)
+            self._log_lock = threading.Lock()
+            # Requests only enqueue their record; a single writer thread formats and writes them in batches
+            self._log_queue = queue.SimpleQueue()
+            self._log_writer = threading.Thread(target=self._write_log_batches,
+                                                args=(self._log_queue, self._log_fh, self._log_lock,
+                                                      self.timestamps, self.latencies_us, self.status_codes),
+                                                daemon=True)
+            self._log_writer.start()
+
+    @property
+    def request_count(self) -> int:
+        """
+        Number of requests completed so far.
+        """
+        return int(np.count_nonzero(self.status_codes))
+
+    @property
+    def errors(self) -> int:
+        """
+        Number of completed requests that failed or did not return a 200.
+        """
+        return self.request_count - int(np.count_nonzero(self.status_codes == 200))
+
+    def _record(self, start_time, latency_us, status_code) -> int:
+        """
+        Claim the next slot of the sample buffers, store the request's outcome in it
+        and return the slot index.
+        """
+        idx = next(self._slots)
+        self.timestamps[idx] = start_time
+        self.latencies_us[idx] = latency_us
+        self.status_codes[idx] = status_code
+        return idx
+
+    def _response_latencies(self) -> np.ndarray:
+        """
+        Latencies, in microseconds, of the completed requests that received a response.
+        """
+        n = self.request_count
+        return self.latencies_us[:n][self.status_codes[:n] > 0]
 
     def request(self) -> None:
         """Send a HTTP request and record latency and errors.
@@ -64,56 +175,401 @@ class LoadTester:
         Records the latency of the request and tracks any errors encountered.
         """
         start_time = time.time()
+        start = time.perf_counter_ns()
+        # Stays -1 unless a response arrives; errors are later counted as status != 200
+        status = -1
         
         try:
             # Get a Response based on Timeout using a custom HTTP Method
-            response = requests.request(self.method, self.url, 
-                                        headers=self.headers, data=self.payload, 
-                                        timeout=self.timeout)
-            latency = time.time() - start_time
-            self.latencies.append(latency)
-            if response.status_code != 200:
-                self.errors += 1
+            response = self.session.request(self.method, self.url, 
+                                            headers=self.headers, data=self.payload, 
+                                            timeout=self.timeout)
+            status = response.status_code
 
         except Exception as e:
             print("Error:", e)
-            latency = time.time() - start_time
-            self.errors += 1
 
-        self.request_count += 1  # Increment request count
+        latency_us = (time.perf_counter_ns() - start) // 1000
+        idx = self._record(start_time, latency_us, status)
+
+        if self.log_enabled:
+            self.log_request(idx)
+
+    def _build_raw_request(self) -> None:
+        """
+        Serialize the request line, headers and body once for the raw backend.
+        The URL, headers and payload are fixed for the lifetime of the tester,
+        so every request sends the same bytes.
+        """
+        parts = urllib.parse.urlsplit(self.url)
+        self._raw_https = parts.scheme == "https"
+        self._raw_host = parts.hostname
+        self._raw_port = parts.port or (443 if self._raw_https else 80)
+        self._ssl_context = ssl.create_default_context() if self._raw_https else None
+
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        # Some servers and CDNs reject requests without a User-Agent; --headers can override it
+        headers = {"Host": parts.netloc, "User-Agent": "python-load-tester", "Accept": "*/*",
+                   "Connection": "keep-alive"}
+        if isinstance(self.payload, dict):
+            body = urllib.parse.urlencode(self.payload).encode()
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        elif isinstance(self.payload, str):
+            body = self.payload.encode()
+        else:
+            body = self.payload or b""
+        if body or self.method in ("POST", "PUT"):
+            headers["Content-Length"] = str(len(body))
+        headers.update(self.headers or {})
+
+        head = f"{self.method} {path} HTTP/1.1\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        self._req_bytes = (head + "\r\n").encode("latin-1") + body
+        # Idle keep-alive sockets shared by the worker threads
+        self._sock_pool = queue.SimpleQueue()
+
+    def _connect(self) -> socket.socket:
+        """
+        Open a new connection to the target host for the raw backend.
+        """
+        sock = socket.create_connection((self._raw_host, self._raw_port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self._raw_https:
+            sock = self._ssl_context.wrap_socket(sock, server_hostname=self._raw_host)
+        return sock
+
+    def _read_response(self, sock) -> tuple:
+        """Read one HTTP/1.1 response off the socket, skipping over the body.
+
+        Args:
+            sock (socket.socket): Connection the request was sent on.
+
+        Returns:
+            tuple: The status code and whether the connection can be reused.
+
+        Raises:
+            _StaleConnection: If the connection is closed or reset before any response bytes arrive.
+        """
+        buf = b""
+        while (end := buf.find(b"\r\n\r\n")) < 0:
+            try:
+                chunk = sock.recv(65536)
+            except ConnectionResetError as e:
+                if buf:
+                    raise
+                raise _StaleConnection("Connection reset before the response") from e
+            if not chunk:
+                if not buf:
+                    raise _StaleConnection("Connection closed before the response")
+                raise ConnectionError("Connection closed before the response headers")
+            buf += chunk
+
+        # Status line is "HTTP/1.1 200 OK"; the code sits right after the first space
+        head = buf[:end].lower()
+        sp = head.find(b" ")
+        status = int(head[sp + 1:sp + 4])
+        if head.startswith(b"http/1.0"):
+            keep_alive = b"\r\nconnection: keep-alive" in head
+        else:
+            keep_alive = b"\r\nconnection: close" not in head
+        buf = buf[end + 4:]
+
+        if self.method == "HEAD" or status in (204, 304) or status < 200:
+            return status, keep_alive
+
+        length = head.find(b"\r\ncontent-length:")
+        if length >= 0:
+            eol = head.find(b"\r\n", length + 2)
+            remaining = int(head[length + 17:eol if eol >= 0 else None]) - len(buf)
+            while remaining > 0:
+                chunk = sock.recv(min(remaining, 65536))
+                if not chunk:
+                    raise ConnectionError("Connection closed mid-body")
+                remaining -= len(chunk)
+        elif b"\r\ntransfer-encoding: chunked" in head:
+            self._skip_chunked_body(sock, buf)
+        else:
+            # No framing: the body runs until the server closes the connection
+            while sock.recv(65536):
+                pass
+            keep_alive = False
+        return status, keep_alive
+
+    def _skip_chunked_body(self, sock, buf) -> None:
+        """
+        Consume a chunked response body (and any trailers) so the connection can be reused.
+        """
+        def fill(buf):
+            chunk = sock.recv(65536)
+            if not chunk:
+                raise ConnectionError("Connection closed mid-body")
+            return buf + chunk
+
+        while True:
+            while (eol := buf.find(b"\r\n")) < 0:
+                buf = fill(buf)
+            size = int(buf[:eol].split(b";")[0], 16)
+            buf = buf[eol + 2:]
+            if size == 0:
+                # Trailer section ends with an empty line
+                while not (buf.startswith(b"\r\n") or b"\r\n\r\n" in buf):
+                    buf = fill(buf)
+                return
+            while len(buf) < size + 2:
+                buf = fill(buf)
+            buf = buf[size + 2:]
+
+    def _raw_request(self) -> None:
+        """Send the pre-serialized request on a pooled keep-alive socket and record latency and errors.
+        A reused socket the server closed while idle (the send fails, or the read hits EOF or a
+        reset before any response bytes) is retried once on a fresh connection; timeouts and
+        failures after a response started are never retried, as with the requests backend.
+        """
+        start_time = time.time()
+        start = time.perf_counter_ns()
+        status = -1
+
+        try:
+            try:
+                sock, reused = self._sock_pool.get_nowait(), True
+            except queue.Empty:
+                sock, reused = self._connect(), False
+            while True:
+                try:
+                    try:
+                        sock.sendall(self._req_bytes)
+                    except socket.timeout:
+                        raise
+                    except OSError as e:
+                        raise _StaleConnection("Connection closed before the request was sent") from e
+                    status, keep_alive = self._read_response(sock)
+                    break
+                except _StaleConnection:
+                    sock.close()
+                    if not reused:
+                        raise
+                    sock, reused = self._connect(), False
+                except Exception:
+                    sock.close()
+                    raise
+            if keep_alive:
+                self._sock_pool.put(sock)
+            else:
+                sock.close()
+
+        except Exception as e:
+            print("Error:", e)
+
+        latency_us = (time.perf_counter_ns() - start) // 1000
+        idx = self._record(start_time, latency_us, status)
+
+        if self.log_enabled:
+            self.log_request(idx)
+
+    async def _request(self, session) -> None:
+        """Send a HTTP request on the shared aiohttp session and record latency and errors.
+
+        Args:
+            session (aiohttp.ClientSession): Session whose connector pools keep-alive connections.
+        """
+        start_time = time.time()
+        start = time.perf_counter_ns()
+        status = -1
+
+        try:
+            async with session.request(self.method, self.url,
+                                       headers=self.headers, data=self.payload,
+                                       timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+                # Drain the body so the connection is released back to the pool
+                await response.read()
+            status = response.status
+
+        except Exception as e:
+            print("Error:", e)
+
+        latency_us = (time.perf_counter_ns() - start) // 1000
+        idx = self._record(start_time, latency_us, status)
+
+        if self.log_enabled:
+            self.log_request(idx)
+
+    async def _httpx_request(self, client) -> None:
+        """Send a HTTP request on the shared HTTP/2 httpx client and record latency and errors.
+
+        Args:
+            client (httpx.AsyncClient): Client multiplexing requests over pooled HTTP/2 connections.
+        """
+        start_time = time.time()
+        start = time.perf_counter_ns()
+        status = -1
+
+        try:
+            # httpx takes form fields as data= and raw bodies as content=
+            if isinstance(self.payload, dict):
+                body = {'data': self.payload}
+            else:
+                body = {'content': self.payload}
+            response = await client.request(self.method, self.url, headers=self.headers, **body)
+            status = response.status_code
+
+        except Exception as e:
+            print("Error:", e)
+
+        latency_us = (time.perf_counter_ns() - start) // 1000
+        idx = self._record(start_time, latency_us, status)
+
+        if self.log_enabled:
+            self.log_request(idx)
+
+    async def _run(self, progress_bar) -> None:
+        """
+        Dispatch the requests from a single event loop, paced at the configured QPS
+        and bounded to `concurrency` requests in flight.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        if self.backend == "httpx":
+            # httpx (with its h2 extra) is only needed for this backend
+            import httpx
+            # Over HTTP/2 the in-flight requests multiplex as streams on a few connections.
+            # Follow redirects like the aiohttp and requests backends so error counts match
+            # Its cookie jar accepts no domains, so response cookies are never sent back
+            client = httpx.AsyncClient(http2=True, timeout=self.timeout, follow_redirects=True,
+                                       cookies=http.cookiejar.CookieJar(
+                                           policy=http.cookiejar.DefaultCookiePolicy(allowed_domains=[])),
+                                       limits=httpx.Limits(max_keepalive_connections=self.concurrency,
+                                                           max_connections=self.concurrency))
+            send = self._httpx_request
+        else:
+            connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.concurrency,
+                                             keepalive_timeout=75)
+            # Like one-off requests, never send response cookies back, so sticky-session
+            # cookies cannot pin the whole run to a single backend
+            client = aiohttp.ClientSession(connector=connector, cookie_jar=aiohttp.DummyCookieJar())
+            send = self._request
+
+        async def bounded_request(session):
+            async with semaphore:
+                await send(session)
+
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.qps
+        async with client as session:
+            tasks = []
+            # Request i is due at start + i/qps, so sleep overshoot never accumulates
+            deadline = loop.time()
+            for i in range(self.max_requests):
+                delay = deadline - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.create_task(bounded_request(session)))
+                progress_bar.update(1)
+                deadline += interval
+            await asyncio.gather(*tasks)
+
+    def _run_event_loop(self, coro) -> None:
+        """
+        Run a coroutine to completion on the configured event loop.
+        uvloop is imported lazily so that it stays an optional dependency.
+        """
+        if self.event_loop != "uvloop":
+            asyncio.run(coro)
+            return
+
+        import uvloop
+        loop = uvloop.new_event_loop()
+        try:
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(coro)
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
 
-        # if self.log_enabled:
-        #     self.log_request(start_time, latency)
-        
     def run(self) -> None:
         """
         Run the Benchmarking Test
         """
-        # Define the Progress Bar
-        progress_bar = tqdm(total=self.max_requests, desc="Testing")
+        # Define the Progress Bar; it only redraws every ~0.5% of the run and at most
+        # every 0.1 s, so update(1) on the dispatch loop is a cheap counter bump
+        progress_bar = tqdm(total=self.max_requests, desc="Testing",
+                            mininterval=0.1, miniters=max(1, self.max_requests // 200))
 
-        # # Run each for a request till the Maximum Request Capacity
-        while self.request_count < self.max_requests:
-            for i in range (self.qps):
-                threading.Thread(target=self.request).start()
+        if self.backend in ("aiohttp", "httpx"):
+            self._run_event_loop(self._run(progress_bar))
+        else:
+            # # Run each for a request till the Maximum Request Capacity
+            target = self._raw_request if self.backend == "raw" else self.request
+            interval = 1 / self.qps
+            deadline = time.monotonic()
+            for i in range(self.max_requests):
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                self.pool.submit(target)
                 progress_bar.update(1)
+                deadline += interval
+            # Wait for the in-flight requests so the report sees all of them
+            self.pool.shutdown(wait=True)
+            if self.backend == "raw":
+                while not self._sock_pool.empty():
+                    self._sock_pool.get_nowait().close()
+            else:
+                self.session.close()
         progress_bar.close()
 
-    def log_request(self, start_time, latency) -> None:
+    def log_request(self, idx) -> None:
         """
-        Log the Results from each request
+        Log the Results from each request, given the sample slot it was recorded in
         """
-        with open(self.log_file, 'a') as f:
-            f.write(f"Timestamp: {start_time}, Latency: {latency} seconds\n")
+        self._log_queue.put(idx)
+
+    @staticmethod
+    def _write_log_batches(log_queue, log_fh, log_lock, timestamps, latencies_us, status_codes) -> None:
+        """
+        Writer thread: block for the next record, then drain everything already queued
+        and write it with a single call. A None record stops the thread.
+        """
+        while True:
+            records = [log_queue.get()]
+            while not log_queue.empty() and records[-1] is not None:
+                records.append(log_queue.get_nowait())
+            done = records[-1] is None
+            if done:
+                records.pop()
+            with log_lock:
+                log_fh.write("".join(f"Timestamp: {timestamps[i]}, Latency: {latencies_us[i] / 1e6} seconds, Status: {status_codes[i]}\n"
+                                     for i in records))
+            if done:
+                return
+
+    def _stop_log_writer(self) -> None:
+        """
+        Let the writer thread finish the queued records and exit.
+        """
+        if self._log_writer.is_alive():
+            self._log_queue.put(None)
+            self._log_writer.join()
 
     def report(self) -> None:
         """
         Report the Results of the Testing for Benchmarking.
         """
-        print("Total Requests:", len(self.latencies))
+        print("Total Requests:", self.request_count)
         print("Total Errors:", self.errors)
         if self.log_enabled:
+            self._stop_log_writer()
             self.log_report()
+            self._log_fh.flush()
+
+    def __del__(self):
+        # Flush whatever is still buffered when the tester goes away
+        log_fh = getattr(self, '_log_fh', None)
+        if log_fh is not None and not log_fh.closed:
+            self._stop_log_writer()
+            log_fh.close()
 
     def log_report(self) -> None:
         """
@@ -122,38 +578,65 @@ class LoadTester:
             Total Requests, TOtal Errors, Average, Max and Minimum Latencies
             Amplitude and the Standard Deviations.
         """
-        with open(self.log_file, 'a') as f:
-            f.write("____________________________________________________________")
-            f.write("___________________ FINAL REPORT ___________________________")
-            f.write("____________________________________________________________")
-            f.write(f"TOTAL REQUESTS: {len(self.latencies)}\n")
-            f.write(f"TOTAL ERRORS: {self.errors}\n")
-
-            f.write(f"\n")
-            f.write(f"Detailed Stats: \n")
-
-            if self.latencies:
-                avg_latency = sum(self.latencies) / len(self.latencies)
-                std_dev = math.sqrt(sum((x - avg_latency) ** 2 for x in self.latencies) / len(self.latencies))
-                
-                f.write(f"Average Latency: {avg_latency} seconds\n")
-                f.write(f"Maximum Latency (Slowest): {max(self.latencies)} seconds\n")
-                f.write(f"Minimum Latency (Fastest): {min(self.latencies)} seconds\n")
-                f.write(f"Amplitude Latency (Difference between Fastest and Slowest): {max(self.latencies)- min(self.latencies)} seconds\n")
-                f.write(f"Standard Deviation: {std_dev} seconds\n")
-
-                if self.percentiles:
-                    for p in self.percentiles:
-                        print(f"{p}-th Percentile Latency:", np.percentile(self.latencies, p))
-                        f.write(f"{p}-th Percentile Latency: {np.percentile(self.latencies, p)}\n")
-                
-                if self.reponses:
-                    response_time_counts = self.calculate_response_time_percentiles(thresholds=self.reponses)
-                    f.write(f"Response Time Thresholds (Percentage of response times above the threshold): {response_time_counts}\n")
+        # Assemble the whole report first and write it out in one call
+        lines = []
+        lines.append("____________________________________________________________")
+        lines.append("___________________ FINAL REPORT ___________________________")
+        lines.append("____________________________________________________________")
+        lines.append(f"TOTAL REQUESTS: {self.request_count}\n")
+        lines.append(f"TOTAL ERRORS: {self.errors}\n")
 
-            else:
-                f.write(f"Average Latency: No Requests made for Latency Computation")
-                print("No requests made.")
+        lines.append(f"\n")
+        lines.append(f"Detailed Stats: \n")
+
+        arr = self._response_latencies()
+        if arr.size:
+            # Statistics are computed on the integer microsecond samples and
+            # only scaled to seconds for display
+            avg_us = arr.mean()
+            # Reuse the mean for the variance (one BLAS dot) and take the extremes once each
+            deviations = arr - avg_us
+            std_us = np.sqrt(deviations.dot(deviations) / arr.size)
+            max_us, min_us = int(arr.max()), int(arr.min())
+            # One partition of the data serves every requested percentile
+            vals_us = _partition_percentiles(arr, self.percentiles) if self.percentiles.size else []
+            avg_latency, std_dev = avg_us / 1e6, std_us / 1e6
+            max_latency, min_latency = max_us / 1e6, min_us / 1e6
+            vals = np.asarray(vals_us, dtype=np.float64) / 1e6
+            
+            lines.append(f"Average Latency: {avg_latency} seconds\n")
+            lines.append(f"Maximum Latency (Slowest): {max_latency} seconds\n")
+            lines.append(f"Minimum Latency (Fastest): {min_latency} seconds\n")
+            lines.append(f"Amplitude Latency (Difference between Fastest and Slowest): {(max_us - min_us) / 1e6} seconds\n")
+            lines.append(f"Standard Deviation: {std_dev} seconds\n")
+
+            if self.percentiles.size:
+                for p, v in zip(self.percentiles, vals):
+                    print(f"{p:g}-th Percentile Latency:", v)
+                    lines.append(f"{p:g}-th Percentile Latency: {v}\n")
+            
+            if self.reponses.size:
+                response_time_counts = self.calculate_response_time_percentiles(thresholds=self.reponses)
+                lines.append(f"Response Time Thresholds (Percentage of response times above the threshold): {response_time_counts}\n")
+
+        else:
+            lines.append(f"Average Latency: No Requests made for Latency Computation")
+            print("No requests made.")
+
+        with self._log_lock:
+            if not hasattr(os, "writev"):
+                # No writev outside POSIX; a single buffered write keeps the same ordering
+                self._log_fh.write("".join(lines))
+                self._log_fh.flush()
+                return
+            data = [line.encode() for line in lines]
+            # Push out the buffered request records first so the report lands after them
+            self._log_fh.flush()
+            fd = self._log_fh.fileno()
+            written = os.writev(fd, data)
+            rest = b"".join(data)[written:]
+            while rest:
+                rest = rest[os.write(fd, rest):]
 
     def calculate_response_time_percentiles(self, thresholds) -> dict:
         """Calculate the percentage of requests meeting specified response time thresholds.
@@ -165,13 +648,19 @@ class LoadTester:
             dict: A dictionary containing the percentage of requests meeting each threshold.
                 Keys are the thresholds and values are the corresponding percentages.
         """
+        latencies = np.sort(self._response_latencies())
+        total_requests = len(latencies)
+
+        # Everything from the first sample >= threshold onwards meets it: O((N + T) log N)
+        # without materialising an N x T comparison matrix; both sides stay uint32 microseconds
+        thr = _to_microseconds(thresholds)
+        counts = total_requests - np.searchsorted(latencies, thr, side='left')
+
+        percentages = (counts / total_requests) * 100
         response_time_counts = {}
-        total_requests = len(self.latencies)
 
-        for threshold in thresholds:
-            count = sum(latency >= threshold for latency in self.latencies)
-            percentage = (count / total_requests) * 100
-            response_time_counts[threshold] = str(percentage) + "%"
+        for threshold, percentage in zip(thresholds, percentages):
+            response_time_counts[float(threshold)] = str(float(percentage)) + "%"
 
         return response_time_counts
 
@@ -186,9 +675,16 @@ def main():
     parser.add_argument("--headers", nargs='*', help="Custom headers as key-value pairs separated by space")
     parser.add_argument("--payload", help="Request payload")
     parser.add_argument("--logging", default=True, help="Logging Enabled/Disabled")
-    parser.add_argument("--percentiles", nargs='+', default=[90], type=list, 
+    parser.add_argument("--concurrency", type=int, default=64, help="Maximum Number of Concurrent Requests")
+    parser.add_argument("--backend", default="aiohttp", choices=["aiohttp", "httpx", "requests", "raw"],
+                        help="HTTP client to use; httpx multiplexes over HTTP/2 (pip install httpx[http2]), "
+                             "raw sends a pre-serialized HTTP/1.1 request on pooled sockets and does not "
+                             "follow redirects, so 3xx responses count as errors")
+    parser.add_argument("--event_loop", default="asyncio", choices=["asyncio", "uvloop"],
+                        help="Event loop for the aiohttp and httpx backends; uvloop (pip install uvloop) lowers per-request syscall overhead on Linux")
+    parser.add_argument("--percentiles", nargs='+', default=[90], type=float, 
                         help="Percentiles for latency reporting as a list of percentile values, e.g., [10, 90]")
-    parser.add_argument("--response_thres", nargs='+', default=[0.25, 0.5], type=list, 
+    parser.add_argument("--response_thres", nargs='+', default=[0.25, 0.5], type=float, 
                         help="Response time Thresholds as a list of time in seconds; e.g, [0.5, 0.25]")
     args = parser.parse_args()
 
@@ -1,9 +1,42 @@
+import asyncio
+import os
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
 import pytest
-from load_tester import LoadTester
-from unittest.mock import patch, MagicMock
+from load_tester import LoadTester, _partition_percentiles
+from unittest.mock import patch, MagicMock, AsyncMock
+
+@pytest.fixture
+def cookie_server():
+    """Local HTTP/1.1 server that sets a sticky-backend cookie and records the Cookie header of every request."""
+    received_cookies = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            received_cookies.append(self.headers.get("Cookie"))
+            self.send_response(200)
+            self.send_header("Set-Cookie", "AWSALB=backend-1; Path=/")
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://localhost:{server.server_address[1]}/", received_cookies
+    server.shutdown()
+    server.server_close()
 
 # Test initialization
-def test_load_tester_initialization():
+def test_load_tester_initialization(tmp_path, monkeypatch):
+    # Logging testers create their log file in the working directory
+    monkeypatch.chdir(tmp_path)
     kwargs = {
         'url': 'http://google.com',
         'qps': 10,
@@ -24,14 +57,20 @@ def test_load_tester_initialization():
     assert load_tester.headers == kwargs['headers']
     assert load_tester.payload == kwargs['payload']
     assert load_tester.errors == 0
-    assert load_tester.latencies == []
+    assert len(load_tester._response_latencies()) == 0
+    assert len(load_tester.latencies_us) == kwargs['max_requests']
     assert load_tester.max_requests == kwargs['max_requests']
     assert load_tester.request_count == 0
     assert load_tester.log_enabled == kwargs['logging']
-    assert load_tester.percentiles == kwargs['percentiles']
+    assert load_tester.percentiles.tolist() == kwargs['percentiles']
+    # The default aiohttp backend builds its client in run(), not here
+    assert not hasattr(load_tester, 'session')
+    assert not hasattr(load_tester, 'pool')
 
 #Test request method
-def test_request_method():
+def test_request_method(tmp_path, monkeypatch):
+    # Logging testers create their log file in the working directory
+    monkeypatch.chdir(tmp_path)
     kwargs = {
         'url': 'http://google.com',
         'qps': 10,
@@ -43,13 +82,16 @@ def test_request_method():
         'logging': True,
         'percentiles': [90, 95, 99],
         'response_thres': [],
+        'backend': 'requests',
     }
     load_tester = LoadTester(kwargs)
     load_tester.request()
     assert load_tester.request_count == 1
-    assert len(load_tester.latencies) == 1
+    assert len(load_tester._response_latencies()) == 1
 
-def test_request_method_successful_request():
+def test_request_method_successful_request(tmp_path, monkeypatch):
+    # Logging testers create their log file in the working directory
+    monkeypatch.chdir(tmp_path)
     # Create a mock response object
     response_mock = MagicMock()
     response_mock.status_code = 200
@@ -64,18 +106,21 @@ def test_request_method_successful_request():
         'logging': True,
         'percentiles': [90, 95, 99],
         'response_thres': [],
+        'backend': 'requests',
     }
-    # Mock the requests.request function to return the mock response
-    with patch('requests.request', return_value=response_mock):
+    # Mock the requests.Session.request function to return the mock response
+    with patch('requests.Session.request', return_value=response_mock):
         
         load_tester = LoadTester(kwargs)
         load_tester.request()
 
     # Check if latency and errors are recorded correctly
-    assert len(load_tester.latencies) == 1
+    assert len(load_tester._response_latencies()) == 1
     assert load_tester.errors == 0
 
-def test_request_method_logging_enabled():
+def test_request_method_logging_enabled(tmp_path, monkeypatch):
+    # Logging testers create their log file in the working directory
+    monkeypatch.chdir(tmp_path)
     kwargs = {
         'url': 'http://google.com',
         'qps': 10,
@@ -87,20 +132,22 @@ def test_request_method_logging_enabled():
         'logging': True,
         'percentiles': [90, 95, 99],
         'response_thres': [],
+        'backend': 'requests',
     }
     # Create a mock response object
     response_mock = MagicMock()
     response_mock.status_code = 200
 
-    # Mock the requests.request function to return the mock response
-    with patch('requests.request', return_value=response_mock):
+    # Mock the requests.Session.request function to return the mock response
+    with patch('requests.Session.request', return_value=response_mock):
         load_tester = LoadTester(kwargs)
         load_tester.log_request = MagicMock()
 
         load_tester.request()
 
-    # Check if log_request method is called
+    # Check if log_request method is called with the slot holding the response's status code
     assert load_tester.log_request.called
+    assert load_tester.status_codes[load_tester.log_request.call_args.args[0]] == 200
 
 def test_request_method_logging_disabled():
     kwargs = {
@@ -114,13 +161,14 @@ def test_request_method_logging_disabled():
         'logging': False,
         'percentiles': [90, 95, 99],
         'response_thres': [],
+        'backend': 'requests',
     }
     # Create a mock response object
     response_mock = MagicMock()
     response_mock.status_code = 200
 
-    # Mock the requests.request function to return the mock response
-    with patch('requests.request', return_value=response_mock):
+    # Mock the requests.Session.request function to return the mock response
+    with patch('requests.Session.request', return_value=response_mock):
         load_tester = LoadTester(kwargs)
         load_tester.log_request = MagicMock()
 
@@ -128,3 +176,383 @@ def test_request_method_logging_disabled():
 
     # Check if log_request method is not called
     assert not load_tester.log_request.called
+
+def test_async_request_method_successful_request():
+    kwargs = {
+        'url': 'http://google.com',
+        'qps': 10,
+        'timeout': 5.0,
+        'max_requests': 100,
+        'method': 'GET',
+        'headers': {'Content-Type': 'application/json'},
+        'payload': {'key': 'value'},
+        'logging': False,
+        'percentiles': [90, 95, 99],
+        'response_thres': [],
+    }
+    # Create a mock aiohttp session whose request() yields a 200 response
+    response_mock = MagicMock()
+    response_mock.status = 200
+    response_mock.read = AsyncMock(return_value=b"")
+    session_mock = MagicMock()
+    session_mock.request.return_value.__aenter__.return_value = response_mock
+
+    load_tester = LoadTester(kwargs)
+    asyncio.run(load_tester._request(session_mock))
+
+    # Check if latency and errors are recorded correctly
+    assert load_tester.request_count == 1
+    assert len(load_tester._response_latencies()) == 1
+    assert load_tester.errors == 0
+
+def test_load_tester_rejects_out_of_range_percentiles(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    kwargs = {
+        'url': 'http://google.com',
+        'qps': 10,
+        'timeout': 5.0,
+        'max_requests': 100,
+        'method': 'GET',
+        'headers': {'Content-Type': 'application/json'},
+        'payload': {'key': 'value'},
+        'logging': True,
+        'percentiles': [90, 101],
+        'response_thres': [],
+    }
+    with pytest.raises(ValueError):
+        LoadTester(kwargs)
+
+    # The config is rejected before any log file is created
+    assert list(tmp_path.iterdir()) == []
+
+def test_calculate_response_time_percentiles():
+    kwargs = {
+        'url': 'http://google.com',
+        'qps': 10,
+        'timeout': 5.0,
+        'max_requests': 100,
+        'method': 'GET',
+        'headers': {'Content-Type': 'application/json'},
+        'payload': {'key': 'value'},
+        'logging': False,
+        'percentiles': [90, 95, 99],
+        'response_thres': [0.25, 0.5],
+    }
+    load_tester = LoadTester(kwargs)
+    for latency_us in [100_000, 250_000, 300_000, 600_000]:
+        load_tester._record(0.0, latency_us, 200)
+
+    response_time_counts = load_tester.calculate_response_time_percentiles(thresholds=[0.25, 0.5, 1.0])
+
+    assert response_time_counts == {0.25: "75.0%", 0.5: "25.0%", 1.0: "0.0%"}
+
+def test_request_method_failed_requests_count_as_errors():
+    kwargs = {
+        'url': 'http://google.com',
+        'qps': 10,
+        'timeout': 5.0,
+        'max_requests': 100,
+        'method': 'GET',
+        'headers': {'Content-Type': 'application/json'},
+        'payload': {'key': 'value'},
+        'logging': False,
+        'percentiles': [90, 95, 99],
+        'response_thres': [],
+        'backend': 'requests',
+    }
+    response_mock = MagicMock()
+    response_mock.status_code = 503
+
+    load_tester = LoadTester(kwargs)
+    with patch('requests.Session.request', return_value=response_mock):
+        load_tester.request()
+    with patch('requests.Session.request', side_effect=ConnectionError("refused")):
+        load_tester.request()
+
+    # Both requests are counted, only the one with a response has a latency sample
+    assert load_tester.request_count == 2
+    assert load_tester.errors == 2
+    assert len(load_tester._response_latencies()) == 1
+
+def test_raw_request_reuses_pooled_socket():
+    kwargs = {
+        'url': 'http://google.com/search?q=load',
+        'qps': 10,
+        'timeout': 5.0,
+        'max_requests': 100,
+        'method': 'GET',
+        'headers': {'Content-Type': 'application/json'},
+        'payload': None,
+        'logging': False,
+        'percentiles': [90, 95, 99],
+        'response_thres': [],
+        'backend': 'raw',
+    }
+    # Create a mock socket that answers each request with a chunked 200 response
+    sock_mock = MagicMock()
+    sock_mock.recv.side_effect = [
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n2\r\nok\r\n",
+        b"0\r\n\r\n",
+        b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok",
+    ]
+
+    load_tester = LoadTester(kwargs)
+    assert load_tester._req_bytes.startswith(b"GET /search?q=load HTTP/1.1\r\nHost: google.com\r\n")
+    assert b"\r\nUser-Agent: python-load-tester\r\n" in load_tester._req_bytes
+
+    with patch.object(load_tester, '_connect', return_value=sock_mock) as connect_mock:
+        load_tester._raw_request()
+        load_tester._raw_request()
+
+    # The second request goes out on the pooled connection
+    assert connect_mock.call_count == 1
+    assert sock_mock.sendall.call_count == 2
+    assert load_tester.request_count == 2
+    assert load_tester.errors == 0
+
+def test_partition_percentiles_matches_numpy():
+    latencies = np.random.default_rng(0).exponential(0.1, 1001)
+    qs = np.asarray([0, 10, 50, 90, 99.9, 100], dtype=np.float64)
+
+    assert np.allclose(_partition_percentiles(latencies, qs), np.percentile(latencies, qs))
+    assert np.allclose(_partition_percentiles(latencies[:1], qs), latencies[0])
+
+def test_log_writer_flushes_queued_records(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    kwargs = {
+        'url': 'http://google.com',
+        'qps': 10,
+        'timeout': 5.0,
+        'max_requests': 100,
+        'method': 'GET',
+        'headers': {'Content-Type': 'application/json'},
+        'payload': {'key': 'value'},
+        'logging': True,
+        'percentiles': [90, 95, 99],
+        'response_thres': [],
+    }
+    load_tester = LoadTester(kwargs)
+    load_tester.log_request(load_tester._record(1.0, 250_000, 200))
+    load_tester.log_request(load_tester._record(2.0, 500_000, -1))
+
+    load_tester._stop_log_writer()
+    load_tester._log_fh.flush()
+
+    with open(tmp_path / load_tester.log_file) as f:
+        assert f.read() == ("Timestamp: 1.0, Latency: 0.25 seconds, Status: 200\n"
+                            "Timestamp: 2.0, Latency: 0.5 seconds, Status: -1\n")
+
+def test_httpx_request_method_successful_request():
+    kwargs = {
+        'url': 'http://google.com',
+        'qps': 10,
+        'timeout': 5.0,
+        'max_requests': 100,
+        'method': 'POST',
+        'headers': {'Content-Type': 'application/json'},
+        'payload': '{"key": "value"}',
+        'logging': False,
+        'percentiles': [90, 95, 99],
+        'response_thres': [],
+        'backend': 'httpx',
+    }
+    # Create a mock httpx client whose request() returns a 200 response
+    response_mock = MagicMock()
+    response_mock.status_code = 200
+    client_mock = MagicMock()
+    client_mock.request = AsyncMock(return_value=response_mock)
+
+    load_tester = LoadTester(kwargs)
+    asyncio.run(load_tester._httpx_request(client_mock))
+
+    # String payloads go out as the raw request body
+    assert client_mock.request.call_args.kwargs['content'] == kwargs['payload']
+    assert load_tester.request_count == 1
+    assert load_tester.errors == 0
+
+@pytest.mark.parametrize("has_writev", [True, False])
+def test_report_written_after_request_log(tmp_path, monkeypatch, has_writev):
+    monkeypatch.chdir(tmp_path)
+    if not has_writev:
+        # Platforms without os.writev (e.g. Windows) fall back to a plain write
+        monkeypatch.delattr(os, "writev")
+    kwargs = {
+        'url': 'http://google.com',
+        'qps': 10,
+        'timeout': 5.0,
+        'max_requests': 100,
+        'method': 'GET',
+        'headers': {'Content-Type': 'application/json'},
+        'payload': {'key': 'value'},
+        'logging': True,
+        'percentiles': [50, 90],
+        'response_thres': [0.25],
+    }
+    load_tester = LoadTester(kwargs)
+    for latency_us in [100_000, 300_000]:
+        load_tester.log_request(load_tester._record(1.0, latency_us, 200))
+
+    load_tester.report()
+
+    with open(tmp_path / load_tester.log_file) as f:
+        log = f.read()
+    assert log.startswith("Timestamp: 1.0, Latency: 0.1 seconds, Status: 200\n"
+                          "Timestamp: 1.0, Latency: 0.3 seconds, Status: 200\n")
+    assert "TOTAL REQUESTS: 2\n" in log
+    assert "50-th Percentile Latency: 0.2\n90-th Percentile Latency: 0.28\n" in log
+    assert log.endswith("{0.25: '50.0%'}\n")
+
+def test_raw_request_does_not_retry_timed_out_reused_socket():
+    kwargs = {
+        'url': 'http://google.com',
+        'qps': 10,
+        'timeout': 0.5,
+        'max_requests': 100,
+        'method': 'POST',
+        'headers': None,
+        'payload': 'key=value',
+        'logging': False,
+        'percentiles': [90, 95, 99],
+        'response_thres': [],
+        'backend': 'raw',
+    }
+    # A kept-alive socket on which the server received the request but never answers
+    sock_mock = MagicMock()
+    sock_mock.recv.side_effect = socket.timeout("timed out")
+
+    load_tester = LoadTester(kwargs)
+    load_tester._sock_pool.put(sock_mock)
+    with patch.object(load_tester, '_connect') as connect_mock:
+        load_tester._raw_request()
+
+    # The POST is sent once and the timeout is reported, not resent on a new connection
+    assert not connect_mock.called
+    assert sock_mock.sendall.call_count == 1
+    assert sock_mock.close.called
+    assert load_tester.request_count == 1
+    assert load_tester.errors == 1
+
+def test_raw_request_retries_stale_reused_socket():
+    kwargs = {
+        'url': 'http://google.com',
+        'qps': 10,
+        'timeout': 0.5,
+        'max_requests': 100,
+        'method': 'GET',
+        'headers': None,
+        'payload': None,
+        'logging': False,
+        'percentiles': [90, 95, 99],
+        'response_thres': [],
+        'backend': 'raw',
+    }
+    # The pooled socket was closed by the server while idle: EOF before any response bytes
+    stale_sock_mock = MagicMock()
+    stale_sock_mock.recv.return_value = b""
+    fresh_sock_mock = MagicMock()
+    fresh_sock_mock.recv.side_effect = [b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n"]
+
+    load_tester = LoadTester(kwargs)
+    load_tester._sock_pool.put(stale_sock_mock)
+    with patch.object(load_tester, '_connect', return_value=fresh_sock_mock) as connect_mock:
+        load_tester._raw_request()
+
+    assert connect_mock.call_count == 1
+    assert fresh_sock_mock.sendall.call_count == 1
+    assert load_tester.request_count == 1
+    assert load_tester.errors == 0
+
+def test_httpx_backend_follows_redirects():
+    httpx = pytest.importorskip("httpx")
+    kwargs = {
+        'url': 'http://google.com',
+        'qps': 1000,
+        'timeout': 5.0,
+        'max_requests': 1,
+        'method': 'GET',
+        'headers': None,
+        'payload': None,
+        'logging': False,
+        'percentiles': [90, 95, 99],
+        'response_thres': [],
+        'backend': 'httpx',
+    }
+    response_mock = MagicMock()
+    response_mock.status_code = 200
+
+    load_tester = LoadTester(kwargs)
+    with patch.object(httpx, 'AsyncClient') as client_cls_mock:
+        client_cls_mock.return_value.__aenter__.return_value.request = AsyncMock(return_value=response_mock)
+        asyncio.run(load_tester._run(MagicMock()))
+
+    # Redirects are followed as on the aiohttp and requests backends
+    assert client_cls_mock.call_args.kwargs['follow_redirects'] is True
+    assert load_tester.request_count == 1
+    assert load_tester.errors == 0
+
+def test_aiohttp_backend_does_not_send_back_cookies(cookie_server):
+    url, received_cookies = cookie_server
+    kwargs = {
+        'url': url,
+        'qps': 1000,
+        'timeout': 5.0,
+        'max_requests': 3,
+        'method': 'GET',
+        'headers': None,
+        'payload': None,
+        'logging': False,
+        'percentiles': [90, 95, 99],
+        'response_thres': [],
+        'concurrency': 1,
+    }
+    load_tester = LoadTester(kwargs)
+    asyncio.run(load_tester._run(MagicMock()))
+
+    # Every request starts without cookies, so a sticky load balancer cannot pin the run
+    assert load_tester.errors == 0
+    assert received_cookies == [None, None, None]
+
+def test_requests_backend_does_not_send_back_cookies(cookie_server):
+    url, received_cookies = cookie_server
+    kwargs = {
+        'url': url,
+        'qps': 1000,
+        'timeout': 5.0,
+        'max_requests': 3,
+        'method': 'GET',
+        'headers': None,
+        'payload': None,
+        'logging': False,
+        'percentiles': [90, 95, 99],
+        'response_thres': [],
+        'backend': 'requests',
+    }
+    load_tester = LoadTester(kwargs)
+    for _ in range(3):
+        load_tester.request()
+
+    assert load_tester.errors == 0
+    assert received_cookies == [None, None, None]
+
+def test_httpx_backend_does_not_send_back_cookies(cookie_server):
+    pytest.importorskip("httpx")
+    url, received_cookies = cookie_server
+    kwargs = {
+        'url': url,
+        'qps': 1000,
+        'timeout': 5.0,
+        'max_requests': 3,
+        'method': 'GET',
+        'headers': None,
+        'payload': None,
+        'logging': False,
+        'percentiles': [90, 95, 99],
+        'response_thres': [],
+        'concurrency': 1,
+        'backend': 'httpx',
+    }
+    load_tester = LoadTester(kwargs)
+    asyncio.run(load_tester._run(MagicMock()))
+
+    assert load_tester.errors == 0
+    assert received_cookies == [None, None, None]